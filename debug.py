@@ -56,12 +56,12 @@ class RandomAgent:
         raise ValueError(f"Unexpected action type: {action_enum}")
 
 
+_SUITS = ("♣", "♦", "♥", "♠")
+_RANKS = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A")
+
 def card_to_string(card):
     """Convert a card to a readable string."""
-    suits = {0: "♣", 1: "♦", 2: "♥", 3: "♠"}
-    ranks = {0: "2", 1: "3", 2: "4", 3: "5", 4: "6", 5: "7", 6: "8", 
-             7: "9", 8: "10", 9: "J", 10: "Q", 11: "K", 12: "A"}
-    return f"{ranks[int(card.rank)]}{suits[int(card.suit)]}"
+    return f"{_RANKS[int(card.rank)]}{_SUITS[int(card.suit)]}"
 
 def debug_poker_game(num_games=3):
     """Run detailed poker game simulations and print all state transitions."""
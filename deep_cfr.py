@@ -4,10 +4,66 @@ import torch.nn as nn
 import torch.nn.functional as F
 import torch.optim as optim
 import numpy as np
-import random
 import pokers as pkrs
-from model import PokerNetwork, encode_state, VERBOSE, set_verbose
-from collections import deque
+import model
+from model import PokerNetwork, encode_state, set_verbose
+
+# Bind the pokers enum members once at import time. The action helpers run
+# on every game step, and each pkrs.ActionEnum.<member> access is an
+# attribute lookup into the extension module.
+FOLD = pkrs.ActionEnum.Fold
+CHECK = pkrs.ActionEnum.Check
+CALL = pkrs.ActionEnum.Call
+RAISE = pkrs.ActionEnum.Raise
+
+class MemoryBuffer:
+    """
+    Fixed-capacity replay memory stored as parallel CPU tensors (SoA).
+
+    Each column (state, action/strategy, weight) lives in one contiguous
+    CPU tensor, so appending is a slot write and sampling a batch is a
+    single index gather per column instead of a Python-level walk over a
+    deque of tuples. Storing torch tensors directly means the sampled
+    batches feed the device-transfer path without a NumPy round trip.
+    Once full, the oldest entries are overwritten ring-buffer style,
+    matching the old deque(maxlen=...) behavior.
+
+    The columns are allocated on first append, so agents that only run
+    inference (checkpoint opponents, play/eval loaders) never pay for
+    replay storage they never write to — like the old deque, an empty
+    buffer costs nothing.
+
+    Args:
+        capacity: Maximum number of samples to keep
+        column_specs: List of (shape, dtype) tuples, one per column;
+                      use () as the shape for scalar columns
+    """
+    def __init__(self, capacity, column_specs):
+        self.capacity = capacity
+        self._column_specs = column_specs
+        self._columns = None
+        self._ptr = 0
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, *values):
+        """Add one sample (one value per column) to the buffer."""
+        if self._columns is None:
+            self._columns = [
+                torch.zeros((self.capacity,) + shape, dtype=dtype)
+                for shape, dtype in self._column_specs
+            ]
+        for column, value in zip(self._columns, values):
+            column[self._ptr] = torch.as_tensor(value)
+        self._ptr = (self._ptr + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+    def sample(self, batch_size):
+        """Sample a batch (with replacement), returning one CPU tensor per column."""
+        indices = torch.randint(0, self._size, (batch_size,))
+        return tuple(column[indices] for column in self._columns)
 
 class DeepCFRAgent:
     def __init__(self, player_id=0, num_players=6, memory_size=200000, device='cpu'):
@@ -20,6 +76,7 @@ class DeepCFRAgent:
         
         # Calculate input size based on state encoding
         input_size = 52 + 52 + 5 + 1 + num_players + num_players + num_players*4 + 1 + 4 + 5
+        self.input_size = input_size
         
         # Create advantage network
         self.advantage_net = PokerNetwork(input_size=input_size, num_actions=self.num_actions).to(device)
@@ -27,44 +84,118 @@ class DeepCFRAgent:
         # Use a smaller learning rate for more stable training
         self.optimizer = optim.Adam(self.advantage_net.parameters(), lr=0.0001, weight_decay=1e-5)
         
-        # Create memory buffer
-        self.advantage_memory = deque(maxlen=memory_size)
-        
+        # Create memory buffer (state, action id, regret)
+        self.advantage_memory = MemoryBuffer(memory_size, [
+            ((input_size,), torch.float32),
+            ((), torch.int64),
+            ((), torch.float32)
+        ])
+
         # Strategy network
         self.strategy_net = PokerNetwork(input_size=input_size, num_actions=self.num_actions).to(device)
         self.strategy_optimizer = optim.Adam(self.strategy_net.parameters(), lr=0.0001, weight_decay=1e-5)
-        self.strategy_memory = deque(maxlen=memory_size)
+        # Strategy memory (state, strategy, iteration)
+        self.strategy_memory = MemoryBuffer(memory_size, [
+            ((input_size,), torch.float32),
+            ((self.num_actions,), torch.float32),
+            ((), torch.float32)
+        ])
         
+        # Compiled inference entry points. torch.compile fuses the small MLP
+        # forward into fewer kernels; the compiled wrappers share parameters
+        # with the underlying modules, so checkpoint save/load keeps going
+        # through the plain modules and training stays on the eager path.
+        use_cuda = str(device).startswith('cuda')
+        if use_cuda and hasattr(torch, 'compile'):
+            self._advantage_inference = torch.compile(self.advantage_net, mode='reduce-overhead')
+            self._strategy_inference = torch.compile(self.strategy_net, mode='reduce-overhead')
+        else:
+            self._advantage_inference = self.advantage_net
+            self._strategy_inference = self.strategy_net
+
+        # Use bfloat16 autocast for inference where the hardware supports it
+        # (training remains FP32 for stability)
+        self._autocast = use_cuda and torch.cuda.is_bf16_supported()
+
+        # Persistent pinned staging buffers (keyed by shape/dtype) so every
+        # training batch goes host->device through the same pinned memory
+        # instead of a fresh pageable allocation
+        self._pin_memory = use_cuda
+        self._staging = {}
+
+        # Cached legal mask / uniform strategy per legal-action pattern
+        # (there are only a handful of distinct patterns)
+        self._mask_cache = {}
+
+        # Reusable single-row encode buffer for the per-decision play path
+        self._encode_buf = np.zeros((1, input_size), dtype=np.float32)
+
         # For keeping statistics
         self.iteration_count = 0
-        
+
         # Regret normalization tracker
         self.max_regret_seen = 1.0
 
+    def _to_device(self, batch):
+        """Copy a CPU batch to the device, staging through pinned memory on CUDA."""
+        tensor = torch.as_tensor(batch)
+        if not self._pin_memory:
+            return tensor.to(self.device)
+
+        key = (tensor.shape, tensor.dtype)
+        staging = self._staging.get(key)
+        if staging is None:
+            staging = torch.empty_like(tensor, pin_memory=True)
+            self._staging[key] = staging
+        staging.copy_(tensor)
+        return staging.to(self.device, non_blocking=True)
+
+    def _legal_mask_and_uniform(self, legal_action_ids):
+        """
+        Return the (mask, uniform strategy) array pair for a legal-action
+        set, built once per distinct pattern and cached. Callers must treat
+        both arrays as read-only.
+        """
+        key = tuple(legal_action_ids)
+        cached = self._mask_cache.get(key)
+        if cached is None:
+            mask = np.zeros(self.num_actions, dtype=np.float32)
+            mask[list(key)] = 1.0
+            cached = (mask, mask / len(key))
+            self._mask_cache[key] = cached
+        return cached
+
+    def _infer(self, net, inputs):
+        """Run an inference forward pass, with bf16 autocast on CUDA."""
+        if self._autocast:
+            with torch.autocast(device_type='cuda', dtype=torch.bfloat16):
+                return net(inputs).float()
+        return net(inputs)
+
     def action_id_to_pokers_action(self, action_id, state):
         """Convert our action ID to Pokers action."""
         try:
             if action_id == 0:  # Fold
-                return pkrs.Action(pkrs.ActionEnum.Fold)
+                return pkrs.Action(FOLD)
             elif action_id == 1:  # Check/Call
-                if pkrs.ActionEnum.Check in state.legal_actions:
-                    return pkrs.Action(pkrs.ActionEnum.Check)
+                if CHECK in state.legal_actions:
+                    return pkrs.Action(CHECK)
                 else:
-                    return pkrs.Action(pkrs.ActionEnum.Call)
+                    return pkrs.Action(CALL)
             elif action_id == 2:  # Raise 0.5x pot
                 bet_amount = min(state.pot * 0.5, state.players_state[state.current_player].stake)
-                if VERBOSE:
+                if model.VERBOSE:
                     print(f"Creating raise action (0.5x pot): amount={bet_amount}, pot={state.pot}")
-                return pkrs.Action(pkrs.ActionEnum.Raise, bet_amount)
+                return pkrs.Action(RAISE, bet_amount)
             elif action_id == 3:  # Raise 1x pot
                 bet_amount = min(state.pot, state.players_state[state.current_player].stake)
-                if VERBOSE:
+                if model.VERBOSE:
                     print(f"Creating raise action (1x pot): amount={bet_amount}, pot={state.pot}")
-                return pkrs.Action(pkrs.ActionEnum.Raise, bet_amount)
+                return pkrs.Action(RAISE, bet_amount)
             else:
                 raise ValueError(f"Unknown action ID: {action_id}")
         except Exception as e:
-            if VERBOSE:
+            if model.VERBOSE:
                 print(f"ERROR creating action {action_id}: {e}")
                 print(f"State: current_player={state.current_player}, legal_actions={state.legal_actions}")
                 print(f"Player stake: {state.players_state[state.current_player].stake}")
@@ -76,11 +207,11 @@ class DeepCFRAgent:
         
         # Check each action type
         for action_enum in state.legal_actions:
-            if action_enum == pkrs.ActionEnum.Fold:
+            if action_enum == FOLD:
                 legal_action_ids.append(0)
-            elif action_enum == pkrs.ActionEnum.Check or action_enum == pkrs.ActionEnum.Call:
+            elif action_enum == CHECK or action_enum == CALL:
                 legal_action_ids.append(1)
-            elif action_enum == pkrs.ActionEnum.Raise:
+            elif action_enum == RAISE:
                 # Add our different raise sizes
                 legal_action_ids.append(2)  # 0.5x pot
                 legal_action_ids.append(3)  # 1x pot
@@ -101,7 +232,7 @@ class DeepCFRAgent:
         # Add recursion depth protection
         max_depth = 1000
         if depth > max_depth:
-            if VERBOSE:
+            if model.VERBOSE:
                 print(f"WARNING: Max recursion depth reached ({max_depth}). Returning zero value.")
             return 0
         
@@ -112,7 +243,7 @@ class DeepCFRAgent:
         current_player = state.current_player
         
         # Debug information for the current state
-        if VERBOSE and depth % 100 == 0:
+        if model.VERBOSE and depth % 100 == 0:
             print(f"Depth: {depth}, Player: {current_player}, Stage: {state.stage}")
         
         # If it's the trained agent's turn
@@ -120,29 +251,31 @@ class DeepCFRAgent:
             legal_action_ids = self.get_legal_action_ids(state)
             
             if not legal_action_ids:
-                if VERBOSE:
+                if model.VERBOSE:
                     print(f"WARNING: No legal actions found for player {current_player} at depth {depth}")
                 return 0
                 
-            state_tensor = torch.FloatTensor(encode_state(state, self.player_id)).to(self.device)
-            
+            # Encode the state once and reuse it for the network input and
+            # the memory entries below (encoding is pure per-state work)
+            encoded_state = encode_state(state, self.player_id)
+            state_tensor = self._to_device(encoded_state)
+
             # Get advantages from network
-            with torch.no_grad():
-                advantages = self.advantage_net(state_tensor.unsqueeze(0))[0]
+            with torch.inference_mode():
+                advantages = self._infer(self._advantage_inference, state_tensor.unsqueeze(0))[0]
                 
-            # Use regret matching to compute strategy
+            # Use regret matching to compute strategy (vectorized over the
+            # cached legal mask; uniform fallback is cached per pattern too)
             advantages_np = advantages.cpu().numpy()
-            advantages_masked = np.zeros(self.num_actions)
-            for a in legal_action_ids:
-                advantages_masked[a] = max(advantages_np[a], 0)
-                
+            legal_mask, uniform_strategy = self._legal_mask_and_uniform(legal_action_ids)
+            advantages_masked = np.maximum(advantages_np, 0) * legal_mask
+
             # Choose an action based on the strategy
-            if sum(advantages_masked) > 0:
-                strategy = advantages_masked / sum(advantages_masked)
+            total_advantage = advantages_masked.sum()
+            if total_advantage > 0:
+                strategy = advantages_masked / total_advantage
             else:
-                strategy = np.zeros(self.num_actions)
-                for a in legal_action_ids:
-                    strategy[a] = 1.0 / len(legal_action_ids)
+                strategy = uniform_strategy
             
             # Choose actions and traverse
             action_values = np.zeros(self.num_actions)
@@ -153,49 +286,44 @@ class DeepCFRAgent:
                     
                     # Check if the action was valid
                     if new_state.status != pkrs.StateStatus.Ok:
-                        if VERBOSE:
+                        if model.VERBOSE:
                             print(f"WARNING: Invalid action {action_id} at depth {depth}. Status: {new_state.status}")
                         continue
                         
                     action_values[action_id] = self.cfr_traverse(new_state, iteration, random_agents, depth + 1)
                 except Exception as e:
-                    if VERBOSE:
+                    if model.VERBOSE:
                         print(f"ERROR in traversal for action {action_id}: {e}")
                     action_values[action_id] = 0
             
             # Compute counterfactual regrets and add to memory
-            ev = sum(strategy[a] * action_values[a] for a in legal_action_ids)
-            
+            # (strategy is zero on illegal actions, so the dot product only
+            # picks up the legal ones)
+            ev = float(np.dot(strategy, action_values))
+
             # Calculate normalization factor (max absolute action value)
-            max_abs_val = max(abs(max(action_values)), abs(min(action_values)), 1.0)
-            
+            max_abs_val = max(np.max(np.abs(action_values)), 1.0)
+
+            # Apply a more stable scaling (sqrt of iteration instead of linear)
+            scale_factor = np.sqrt(iteration) if iteration > 1 else 1.0
+
+            # Normalize, clip and scale all regrets in one vectorized pass
+            scaled_regrets = np.clip((action_values - ev) / max_abs_val, -10.0, 10.0) * scale_factor
+
             for action_id in legal_action_ids:
-                # Calculate regret
-                regret = action_values[action_id] - ev
-                
-                # Normalize and clip regret
-                normalized_regret = regret / max_abs_val
-                clipped_regret = np.clip(normalized_regret, -10.0, 10.0)
-                
-                # Apply a more stable scaling (sqrt of iteration instead of linear)
-                scale_factor = np.sqrt(iteration) if iteration > 1 else 1.0
-                
-                self.advantage_memory.append((
-                    encode_state(state, self.player_id),
+                self.advantage_memory.append(
+                    encoded_state,
                     action_id,
-                    clipped_regret * scale_factor
-                ))
+                    scaled_regrets[action_id]
+                )
             
-            # Add to strategy memory
-            strategy_full = np.zeros(self.num_actions)
-            for a in legal_action_ids:
-                strategy_full[a] = strategy[a]
-            
-            self.strategy_memory.append((
-                encode_state(state, self.player_id),
-                strategy_full,
+            # Add to strategy memory (strategy is already zero on illegal
+            # actions, so it is stored as-is)
+            self.strategy_memory.append(
+                encoded_state,
+                strategy,
                 iteration  # Keep linear weighting for strategy (this is fine)
-            ))
+            )
             
             return ev
             
@@ -208,13 +336,13 @@ class DeepCFRAgent:
                 
                 # Check if the action was valid
                 if new_state.status != pkrs.StateStatus.Ok:
-                    if VERBOSE:
+                    if model.VERBOSE:
                         print(f"WARNING: Random agent made invalid action at depth {depth}. Status: {new_state.status}")
                     return 0
                     
                 return self.cfr_traverse(new_state, iteration, random_agents, depth + 1)
             except Exception as e:
-                if VERBOSE:
+                if model.VERBOSE:
                     print(f"ERROR in random agent traversal: {e}")
                 return 0
 
@@ -227,13 +355,12 @@ class DeepCFRAgent:
         total_loss = 0
         
         for _ in range(epochs):
-            # Sample batch from memory
-            batch = random.sample(self.advantage_memory, batch_size)
-            states, actions, regrets = zip(*batch)
-            
-            state_tensors = torch.FloatTensor(np.array(states)).to(self.device)
-            action_tensors = torch.LongTensor(np.array(actions)).to(self.device)
-            regret_tensors = torch.FloatTensor(np.array(regrets)).to(self.device)
+            # Sample batch from memory (already contiguous arrays, no rebuild)
+            states, actions, regrets = self.advantage_memory.sample(batch_size)
+
+            state_tensors = self._to_device(states)
+            action_tensors = self._to_device(actions)
+            regret_tensors = self._to_device(regrets)
             
             # Forward pass
             advantages = self.advantage_net(state_tensors)
@@ -256,13 +383,12 @@ class DeepCFRAgent:
         # Calculate some statistics on regrets for debugging
         if len(self.advantage_memory) > 100:
             # Sample regrets
-            sample = random.sample(self.advantage_memory, 100)
-            regrets = [r for _, _, r in sample]
-            avg_regret = sum(regrets) / len(regrets)
-            max_regret = max(regrets)
-            min_regret = min(regrets)
-            
-            if VERBOSE:
+            _, _, regrets = self.advantage_memory.sample(100)
+            avg_regret = regrets.mean().item()
+            max_regret = regrets.max().item()
+            min_regret = regrets.min().item()
+
+            if model.VERBOSE:
                 print(f"  Regret stats: min={min_regret:.4f}, max={max_regret:.4f}, avg={avg_regret:.4f}")
         
         return avg_loss
@@ -276,23 +402,23 @@ class DeepCFRAgent:
         total_loss = 0
         
         for _ in range(epochs):
-            # Sample batch from memory
-            batch = random.sample(self.strategy_memory, batch_size)
-            states, strategies, iterations = zip(*batch)
-            
-            state_tensors = torch.FloatTensor(np.array(states)).to(self.device)
-            strategy_tensors = torch.FloatTensor(np.array(strategies)).to(self.device)
-            iteration_tensors = torch.FloatTensor(iterations).to(self.device).unsqueeze(1)
+            # Sample batch from memory (already contiguous arrays, no rebuild)
+            states, strategies, iterations = self.strategy_memory.sample(batch_size)
+
+            state_tensors = self._to_device(states)
+            strategy_tensors = self._to_device(strategies)
+            iteration_tensors = self._to_device(iterations).unsqueeze(1)
             
             # Weight samples by iteration (Linear CFR)
             weights = iteration_tensors / torch.sum(iteration_tensors)
             
             # Forward pass
             logits = self.strategy_net(state_tensors)
-            predicted_strategies = F.softmax(logits, dim=1)
-            
-            # Compute weighted cross-entropy loss
-            loss = -torch.sum(weights * torch.sum(strategy_tensors * torch.log(predicted_strategies + 1e-8), dim=1))
+            log_predicted = F.log_softmax(logits, dim=1)
+
+            # Compute weighted cross-entropy loss directly from log-probs
+            # (log_softmax is one fused kernel and avoids the epsilon hack)
+            loss = -torch.sum(weights * torch.sum(strategy_tensors * log_predicted, dim=1))
             total_loss += loss.item()
             
             self.strategy_optimizer.zero_grad()
@@ -301,31 +427,70 @@ class DeepCFRAgent:
             
         return total_loss / epochs
 
+    def strategy_probs_batch(self, encoded_states):
+        """
+        Run a single strategy network forward pass for a batch of encoded
+        states and return the action probabilities as a (N, num_actions)
+        NumPy array.
+
+        Batching all pending decisions into one call keeps the launch count
+        proportional to the number of decision frontiers rather than the
+        number of individual decisions.
+        """
+        state_tensors = self._to_device(np.asarray(encoded_states, dtype=np.float32))
+
+        with torch.inference_mode():
+            logits = self._infer(self._strategy_inference, state_tensors)
+            return F.softmax(logits, dim=1).cpu().numpy()
+
+    def sample_actions_batch(self, encoded_states, legal_masks):
+        """
+        Sample one action ID per row for a batch of encoded states.
+
+        legal_masks is an (N, num_actions) array with 1.0 on legal action
+        IDs. Masking, renormalization and the multinomial draw all happen
+        on the device, so the only device-to-host transfer per frontier is
+        the final vector of sampled action IDs (no per-step sync on the
+        full probability matrix).
+        """
+        state_tensors = self._to_device(np.asarray(encoded_states, dtype=np.float32))
+        mask_tensors = self._to_device(np.asarray(legal_masks, dtype=np.float32))
+
+        with torch.inference_mode():
+            logits = self._infer(self._strategy_inference, state_tensors)
+            probs = F.softmax(logits, dim=1) * mask_tensors
+            totals = probs.sum(dim=1, keepdim=True)
+            # Fall back to uniform over legal actions where the network puts
+            # no mass on any legal action
+            uniform = mask_tensors / mask_tensors.sum(dim=1, keepdim=True)
+            probs = torch.where(totals > 0, probs / totals, uniform)
+            actions = torch.multinomial(probs, 1).squeeze(1)
+
+        return actions.cpu().tolist()
+
     def choose_action(self, state):
         """Choose an action for the given state during actual play."""
         legal_action_ids = self.get_legal_action_ids(state)
-        
+
         if not legal_action_ids:
             # Default to call if no legal actions (shouldn't happen)
             return pkrs.Action(pkrs.ActionEnum.Call)
-            
-        state_tensor = torch.FloatTensor(encode_state(state, self.player_id)).unsqueeze(0).to(self.device)
-        
-        with torch.no_grad():
-            logits = self.strategy_net(state_tensor)
-            probs = F.softmax(logits, dim=1)[0].cpu().numpy()
-        
-        # Filter to only legal actions
-        legal_probs = np.array([probs[a] for a in legal_action_ids])
-        if np.sum(legal_probs) > 0:
-            legal_probs = legal_probs / np.sum(legal_probs)
+
+        encode_state(state, self.player_id, out=self._encode_buf[0])
+        probs = self.strategy_probs_batch(self._encode_buf)[0]
+
+        # Filter to only legal actions (cached mask, cached uniform fallback)
+        legal_mask, uniform_strategy = self._legal_mask_and_uniform(legal_action_ids)
+        legal_probs = probs * legal_mask
+        total_prob = legal_probs.sum()
+        if total_prob > 0:
+            legal_probs = legal_probs / total_prob
         else:
-            legal_probs = np.ones(len(legal_action_ids)) / len(legal_action_ids)
-        
+            legal_probs = uniform_strategy
+
         # Choose action based on probabilities
-        action_idx = np.random.choice(len(legal_action_ids), p=legal_probs)
-        action_id = legal_action_ids[action_idx]
-        
+        action_id = np.random.choice(self.num_actions, p=legal_probs)
+
         return self.action_id_to_pokers_action(action_id, state)
 
     def save_model(self, path_prefix):
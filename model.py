@@ -30,98 +30,92 @@ class PokerNetwork(nn.Module):
         x = F.relu(self.fc5(x))
         return self.fc6(x)
 
-def encode_state(state, player_id=0):
+def encode_state(state, player_id=0, out=None):
     """
     Convert a Pokers state to a neural network input tensor.
-    
+
     Args:
         state: The Pokers state
         player_id: The ID of the player for whom we're encoding
+        out: Optional preallocated float32 feature vector to fill in place
+             (zeroed first), so batch encoders can write rows of one matrix
+             instead of allocating per state
     """
-    encoded = []
-    num_players = len(state.players_state)
-    
+    # Pull the player-state list across the FFI boundary once; every
+    # state.players_state access below would rebuild it
+    players_state = state.players_state
+    num_players = len(players_state)
+
     # Print debug info only if verbose
     if VERBOSE:
         print(f"Encoding state: current_player={state.current_player}, stage={state.stage}")
-        print(f"Player states: {[(p.player, p.stake, p.bet_chips) for p in state.players_state]}")
+        print(f"Player states: {[(p.player, p.stake, p.bet_chips) for p in players_state]}")
         print(f"Pot: {state.pot}")
-    
-    # Encode player's hole cards
-    hand_cards = state.players_state[player_id].hand
-    hand_enc = np.zeros(52)
-    for card in hand_cards:
-        card_idx = int(card.suit) * 13 + int(card.rank)
-        hand_enc[card_idx] = 1
-    encoded.append(hand_enc)
-    
+
+    # Fill one preallocated feature vector section by section instead of
+    # concatenating a dozen small arrays
+    num_feats = 52 + 52 + 5 + 1 + num_players + num_players + num_players*4 + 1 + 4 + 5
+    if out is None:
+        encoded = np.zeros(num_feats, dtype=np.float32)
+    else:
+        encoded = out
+        encoded[:] = 0.0
+
+    # Encode player's hole cards (one fancy-index write for the one-hots)
+    hand_cards = players_state[player_id].hand
+    if hand_cards:
+        encoded[[int(card.suit) * 13 + int(card.rank) for card in hand_cards]] = 1
+
     # Encode community cards
-    community_enc = np.zeros(52)
-    for card in state.public_cards:
-        card_idx = int(card.suit) * 13 + int(card.rank)
-        community_enc[card_idx] = 1
-    encoded.append(community_enc)
-    
-    # Encode game stage
-    stage_enc = np.zeros(5)  # Preflop, Flop, Turn, River, Showdown
-    stage_enc[int(state.stage)] = 1
-    encoded.append(stage_enc)
-    
+    public_cards = state.public_cards
+    if public_cards:
+        encoded[[52 + int(card.suit) * 13 + int(card.rank) for card in public_cards]] = 1
+
+    # Encode game stage (Preflop, Flop, Turn, River, Showdown)
+    encoded[104 + int(state.stage)] = 1
+
     # Get initial stake - prevent division by zero
-    initial_stake = state.players_state[0].stake
+    initial_stake = players_state[0].stake
     if initial_stake <= 0:
         if VERBOSE:
             print(f"WARNING: Initial stake is zero or negative: {initial_stake}")
         initial_stake = 1.0  # Use 1.0 as a fallback to prevent division by zero
-    
+
     # Encode pot size (normalized by initial stake)
-    pot_enc = [state.pot / initial_stake]
-    encoded.append(pot_enc)
-    
+    encoded[109] = state.pot / initial_stake
+
     # Encode button position
-    button_enc = np.zeros(num_players)
-    button_enc[state.button] = 1
-    encoded.append(button_enc)
-    
+    offset = 110
+    encoded[offset + state.button] = 1
+    offset += num_players
+
     # Encode current player
-    current_player_enc = np.zeros(num_players)
-    current_player_enc[state.current_player] = 1
-    encoded.append(current_player_enc)
-    
-    # Encode player states
+    encoded[offset + state.current_player] = 1
+    offset += num_players
+
+    # Encode player states (active status, bet, pot chips, remaining stake)
     for p in range(num_players):
-        player_state = state.players_state[p]
-        
-        # Active status
-        active_enc = [1.0 if player_state.active else 0.0]
-        
-        # Current bet
-        bet_enc = [player_state.bet_chips / initial_stake]
-        
-        # Pot chips (already won)
-        pot_chips_enc = [player_state.pot_chips / initial_stake]
-        
-        # Remaining stake
-        stake_enc = [player_state.stake / initial_stake]
-        
-        encoded.append(np.concatenate([active_enc, bet_enc, pot_chips_enc, stake_enc]))
-    
+        player_state = players_state[p]
+        encoded[offset] = 1.0 if player_state.active else 0.0
+        encoded[offset + 1] = player_state.bet_chips / initial_stake
+        encoded[offset + 2] = player_state.pot_chips / initial_stake
+        encoded[offset + 3] = player_state.stake / initial_stake
+        offset += 4
+
     # Encode minimum bet
-    min_bet_enc = [state.min_bet / initial_stake]
-    encoded.append(min_bet_enc)
-    
-    # Encode legal actions
-    legal_actions_enc = np.zeros(4)  # Fold, Check, Call, Raise
+    encoded[offset] = state.min_bet / initial_stake
+    offset += 1
+
+    # Encode legal actions (Fold, Check, Call, Raise)
     for action_enum in state.legal_actions:
-        legal_actions_enc[int(action_enum)] = 1
-    encoded.append(legal_actions_enc)
-    
-    # Encode previous action if available
-    prev_action_enc = np.zeros(4 + 1)  # Action type + normalized amount
-    if state.from_action is not None:
-        prev_action_enc[int(state.from_action.action.action)] = 1
-        prev_action_enc[4] = state.from_action.action.amount / initial_stake
-    encoded.append(prev_action_enc)
-    
-    # Concatenate all features
-    return np.concatenate(encoded)
\ No newline at end of file
+        encoded[offset + int(action_enum)] = 1
+    offset += 4
+
+    # Encode previous action if available (action type + normalized amount)
+    from_action = state.from_action
+    if from_action is not None:
+        prev_action = from_action.action
+        encoded[offset + int(prev_action.action)] = 1
+        encoded[offset + 4] = prev_action.amount / initial_stake
+
+    return encoded
\ No newline at end of file
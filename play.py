@@ -6,8 +6,10 @@ import argparse
 import os
 import random
 import glob
+import sys
+from concurrent.futures import ThreadPoolExecutor
 from deep_cfr import DeepCFRAgent
-from model import set_verbose
+from model import set_verbose, encode_state
 
 def get_action_description(action):
     """Convert a pokers action to a human-readable string."""
@@ -22,111 +24,151 @@ def get_action_description(action):
     else:
         return f"Unknown action: {action.action}"
 
+# Dedicated RNG instance for game seeds and model selection; keeps this
+# module off the shared module-level generator (and its lock) when play
+# or evaluation runs alongside other threads
+_py_rng = random.Random()
+
+# The three non-parametric actions are value-like; build them once at
+# import instead of crossing the extension boundary per decision. Raise
+# actions still need per-call construction because the amount varies.
+_ACT_FOLD = pkrs.Action(pkrs.ActionEnum.Fold)
+_ACT_CHECK = pkrs.Action(pkrs.ActionEnum.Check)
+_ACT_CALL = pkrs.Action(pkrs.ActionEnum.Call)
+
+# Card formatting tables, built once; card_to_string runs inside list
+# comprehensions over every hand and board displayed
+_SUITS = ("♣", "♦", "♥", "♠")
+_RANKS = ("2", "3", "4", "5", "6", "7", "8", "9", "10", "J", "Q", "K", "A")
+
 def card_to_string(card):
     """Convert a poker card to a readable string."""
-    suits = {0: "♣", 1: "♦", 2: "♥", 3: "♠"}
-    ranks = {0: "2", 1: "3", 2: "4", 3: "5", 4: "6", 5: "7", 6: "8", 
-             7: "9", 8: "10", 9: "J", 10: "Q", 11: "K", 12: "A"}
-    
-    return f"{ranks[int(card.rank)]}{suits[int(card.suit)]}"
+    return f"{_RANKS[int(card.rank)]}{_SUITS[int(card.suit)]}"
 
 def display_game_state(state, player_id=0):
     """Display the current game state in a human-readable format."""
-    print("\n" + "="*70)
-    
+    # Accumulate the whole block and emit it with a single write instead of
+    # one syscall per print
+    lines = ["\n" + "="*70]
+
     # Fix for Stage enum - convert to string properly
     stage_names = {
         0: "PreFlop",
-        1: "Flop", 
-        2: "Turn", 
-        3: "River", 
+        1: "Flop",
+        2: "Turn",
+        3: "River",
         4: "Showdown"
     }
     stage_name = stage_names.get(int(state.stage), str(state.stage))
-    print(f"Stage: {stage_name}")
-    
-    print(f"Pot: ${state.pot:.2f}")
-    print(f"Button position: Player {state.button}")
-    
+    lines.append(f"Stage: {stage_name}")
+
+    lines.append(f"Pot: ${state.pot:.2f}")
+    lines.append(f"Button position: Player {state.button}")
+
     # Show community cards
     community_cards = " ".join([card_to_string(card) for card in state.public_cards])
-    print(f"Community cards: {community_cards if community_cards else 'None'}")
-    
+    lines.append(f"Community cards: {community_cards if community_cards else 'None'}")
+
     # Show player's hand
     hand = " ".join([card_to_string(card) for card in state.players_state[player_id].hand])
-    print(f"Your hand: {hand}")
-    
+    lines.append(f"Your hand: {hand}")
+
     # Show all players' states
-    print("\nPlayers:")
+    lines.append("\nPlayers:")
     for i, p in enumerate(state.players_state):
         status = "YOU" if i == player_id else "AI"
         active = "Active" if p.active else "Folded"
-        print(f"Player {i} ({status}): ${p.stake:.2f} - Bet: ${p.bet_chips:.2f} - {active}")
-    
+        lines.append(f"Player {i} ({status}): ${p.stake:.2f} - Bet: ${p.bet_chips:.2f} - {active}")
+
     # Show legal actions for human player if it's their turn
     if state.current_player == player_id:
-        print("\nLegal actions:")
-        for action_enum in state.legal_actions:
-            if action_enum == pkrs.ActionEnum.Fold:
-                print("  f: Fold")
-            elif action_enum == pkrs.ActionEnum.Check:
-                print("  c: Check")
-            elif action_enum == pkrs.ActionEnum.Call:
-                # Calculate call amount
-                call_amount = max(0, state.min_bet - state.players_state[player_id].bet_chips)
-                print(f"  c: Call ${call_amount:.2f}")
-            elif action_enum == pkrs.ActionEnum.Raise:
-                min_raise = state.min_bet
-                max_raise = state.players_state[player_id].stake
-                print(f"  r: Raise (min: ${min_raise:.2f}, max: ${max_raise:.2f})")
-                print("    h: Raise half pot")
-                print("    p: Raise pot")
-                print("    m: Custom raise amount")
-    
-    print("="*70)
+        # Pull the legal-action list across the FFI boundary once; the pyo3
+        # enums are unhashable, so keep it as a tuple (at most 4 entries)
+        legal = tuple(state.legal_actions)
+        lines.append("\nLegal actions:")
+        if pkrs.ActionEnum.Fold in legal:
+            lines.append("  f: Fold")
+        if pkrs.ActionEnum.Check in legal:
+            lines.append("  c: Check")
+        if pkrs.ActionEnum.Call in legal:
+            # Calculate call amount
+            call_amount = max(0, state.min_bet - state.players_state[player_id].bet_chips)
+            lines.append(f"  c: Call ${call_amount:.2f}")
+        if pkrs.ActionEnum.Raise in legal:
+            min_raise = state.min_bet
+            max_raise = state.players_state[player_id].stake
+            lines.append(f"  r: Raise (min: ${min_raise:.2f}, max: ${max_raise:.2f})")
+            lines.append("    h: Raise half pot")
+            lines.append("    p: Raise pot")
+            lines.append("    m: Custom raise amount")
+
+    lines.append("="*70 + "\n")
+    sys.stdout.write("\n".join(lines))
+    sys.stdout.flush()
+
+def _handle_fold(state, player_id, legal):
+    if pkrs.ActionEnum.Fold in legal:
+        return _ACT_FOLD
+    return None
+
+def _handle_check_call(state, player_id, legal):
+    if pkrs.ActionEnum.Check in legal:
+        return _ACT_CHECK
+    if pkrs.ActionEnum.Call in legal:
+        return _ACT_CALL
+    return None
+
+def _handle_half_pot(state, player_id, legal):
+    if pkrs.ActionEnum.Raise not in legal:
+        return None
+    max_bet = state.players_state[player_id].stake
+    return pkrs.Action(pkrs.ActionEnum.Raise, min(state.pot * 0.5, max_bet))
+
+def _handle_pot(state, player_id, legal):
+    if pkrs.ActionEnum.Raise not in legal:
+        return None
+    max_bet = state.players_state[player_id].stake
+    return pkrs.Action(pkrs.ActionEnum.Raise, min(state.pot, max_bet))
+
+def _handle_custom_raise(state, player_id, legal):
+    if pkrs.ActionEnum.Raise not in legal:
+        return None
+    min_bet = state.min_bet
+    max_bet = state.players_state[player_id].stake
+    while True:
+        try:
+            amount_str = input(f"Enter raise amount (min: {min_bet:.2f}, max: {max_bet:.2f}): ")
+            amount = float(amount_str)
+            if min_bet <= amount <= max_bet:
+                return pkrs.Action(pkrs.ActionEnum.Raise, amount)
+            print(f"Amount must be between {min_bet:.2f} and {max_bet:.2f}")
+        except ValueError:
+            print("Please enter a valid number")
+
+# Input dispatch table, built once; each handler returns an action or None
+# to signal an invalid choice for the current legal set
+_HANDLERS = {
+    'f': _handle_fold,
+    'c': _handle_check_call,
+    'h': _handle_half_pot,
+    'p': _handle_pot,
+    'r': _handle_custom_raise,
+    'm': _handle_custom_raise,
+}
 
 def get_human_action(state, player_id=0):
     """Get action from human player via console input."""
+    # Pull the legal-action list across the FFI boundary once per decision;
+    # the pyo3 enums are unhashable, so keep it as a tuple (at most 4
+    # entries) — every retry is then a dict lookup plus short in scans
+    legal = tuple(state.legal_actions)
     while True:
         action_input = input("Your action (f=fold, c=check/call, r=raise, h=half pot, p=pot, m=custom): ").strip().lower()
-        
-        # Process fold
-        if action_input == 'f' and pkrs.ActionEnum.Fold in state.legal_actions:
-            return pkrs.Action(pkrs.ActionEnum.Fold)
-        
-        # Process check/call
-        elif action_input == 'c':
-            if pkrs.ActionEnum.Check in state.legal_actions:
-                return pkrs.Action(pkrs.ActionEnum.Check)
-            elif pkrs.ActionEnum.Call in state.legal_actions:
-                return pkrs.Action(pkrs.ActionEnum.Call)
-        
-        # Process raise shortcuts
-        elif action_input in ['r', 'h', 'p', 'm'] and pkrs.ActionEnum.Raise in state.legal_actions:
-            player_state = state.players_state[player_id]
-            min_bet = state.min_bet
-            max_bet = player_state.stake
-            
-            if action_input == 'h':  # Half pot
-                bet_amount = min(state.pot * 0.5, max_bet)
-                return pkrs.Action(pkrs.ActionEnum.Raise, bet_amount)
-            
-            elif action_input == 'p':  # Full pot
-                bet_amount = min(state.pot, max_bet)
-                return pkrs.Action(pkrs.ActionEnum.Raise, bet_amount)
-            
-            elif action_input == 'm' or action_input == 'r':  # Custom amount
-                while True:
-                    try:
-                        amount_str = input(f"Enter raise amount (min: {min_bet:.2f}, max: {max_bet:.2f}): ")
-                        amount = float(amount_str)
-                        if min_bet <= amount <= max_bet:
-                            return pkrs.Action(pkrs.ActionEnum.Raise, amount)
-                        else:
-                            print(f"Amount must be between {min_bet:.2f} and {max_bet:.2f}")
-                    except ValueError:
-                        print("Please enter a valid number")
-        
+        handler = _HANDLERS.get(action_input)
+        if handler is not None:
+            action = handler(state, player_id, legal)
+            if action is not None:
+                return action
         print("Invalid action. Please try again.")
 
 def select_random_models(models_dir, num_models=5, model_pattern="*.pt"):
@@ -149,7 +191,7 @@ def select_random_models(models_dir, num_models=5, model_pattern="*.pt"):
         return []
     
     # Select random models
-    selected_models = random.sample(model_files, min(num_models, len(model_files)))
+    selected_models = _py_rng.sample(model_files, min(num_models, len(model_files)))
     return selected_models
 
 def play_against_models(models_dir=None, model_pattern="*.pt", num_models=5, 
@@ -180,14 +222,22 @@ def play_against_models(models_dir=None, model_pattern="*.pt", num_models=5,
     device = 'cuda' if torch.cuda.is_available() else 'cpu'
     print(f"Using device: {device}")
     
-    # Track game statistics
+    # Track game statistics. Profit and balance accumulate in place in one
+    # float64 buffer instead of re-boxing Python floats every hand.
     num_games = 0
-    total_profit = 0
-    player_stake = initial_stake
-    
+    stats = np.zeros(2, dtype=np.float64)  # [total profit, current balance]
+    stats[1] = initial_stake
+
+    # Share one loaded agent per distinct checkpoint path. Filling several
+    # seats with the same checkpoint reuses the networks instead of
+    # duplicating them in memory and reloading. Entries not seated in the
+    # current game are evicted each hand, so reshuffling from a large
+    # checkpoint directory cannot grow the cache without bound.
+    loaded_agents = {}
+
     # Main game loop
     while True:
-        if player_stake <= 0:
+        if stats[1] <= 0:
             print("\nYou're out of chips! Game over.")
             break
         
@@ -208,6 +258,15 @@ def play_against_models(models_dir=None, model_pattern="*.pt", num_models=5,
             model_paths = []
             print("No models directory specified, using random agents.")
         
+        # Evict cached agents whose checkpoint is not seated this game
+        current_paths = set(model_paths)
+        for path in list(loaded_agents):
+            if path not in current_paths:
+                del loaded_agents[path]
+
+        # Load any newly selected checkpoints in parallel before seating
+        load_errors = _load_checkpoints(model_paths, device, loaded_agents) if models_dir else {}
+
         # Create agents for each position
         agents = []
         for i in range(6):
@@ -218,14 +277,13 @@ def play_against_models(models_dir=None, model_pattern="*.pt", num_models=5,
                 # Determine which model to use
                 model_idx = (i - 1) if i > player_position else i
                 if models_dir and model_idx < len(model_paths):
-                    # Load model
-                    try:
-                        agent = DeepCFRAgent(player_id=i, num_players=6, device=device)
-                        agent.load_model(model_paths[model_idx])
-                        agents.append(agent)
-                        print(f"Loaded model for Player {i}: {os.path.basename(model_paths[model_idx])}")
-                    except Exception as e:
-                        print(f"Error loading model for Player {i}: {e}")
+                    path = model_paths[model_idx]
+                    agent = loaded_agents.get(path)
+                    if agent is not None:
+                        agents.append(SeatView(agent, i))
+                        print(f"Loaded model for Player {i}: {os.path.basename(path)}")
+                    else:
+                        print(f"Error loading model for Player {i}: {load_errors.get(path)}")
                         print("Using random agent instead")
                         agents.append(RandomAgent(i))
                 else:
@@ -235,7 +293,7 @@ def play_against_models(models_dir=None, model_pattern="*.pt", num_models=5,
         
         num_games += 1
         print(f"\n--- Game {num_games} ---")
-        print(f"Your current balance: ${player_stake:.2f}")
+        print(f"Your current balance: ${stats[1]:.2f}")
         
         # Rotate button position for fairness
         button_pos = (num_games - 1) % 6
@@ -247,7 +305,7 @@ def play_against_models(models_dir=None, model_pattern="*.pt", num_models=5,
             sb=small_blind,
             bb=big_blind,
             stake=initial_stake,
-            seed=random.randint(0, 10000)
+            seed=_py_rng.randint(0, 10000)
         )
         
         # Play until the game is over
@@ -290,40 +348,227 @@ def play_against_models(models_dir=None, model_pattern="*.pt", num_models=5,
         
         # Update player's stake
         game_profit = state.players_state[player_position].reward
-        total_profit += game_profit
-        player_stake += game_profit
+        stats[0] += game_profit
+        stats[1] += game_profit
         
         print(f"\nThis game: {'Won' if game_profit > 0 else 'Lost'} ${abs(game_profit):.2f}")
-        print(f"Running total: ${total_profit:.2f}")
-        print(f"Current balance: ${player_stake:.2f}")
+        print(f"Running total: ${stats[0]:.2f}")
+        print(f"Current balance: ${stats[1]:.2f}")
     
     # Show overall statistics
     print("\n--- Overall Statistics ---")
     print(f"Games played: {num_games}")
-    print(f"Total profit: ${total_profit:.2f}")
-    print(f"Average profit per game: ${total_profit/num_games if num_games > 0 else 0:.2f}")
-    print(f"Final balance: ${player_stake:.2f}")
+    print(f"Total profit: ${stats[0]:.2f}")
+    print(f"Average profit per game: ${stats[0]/num_games if num_games > 0 else 0:.2f}")
+    print(f"Final balance: ${stats[1]:.2f}")
+
+def _warm_up(agent):
+    """
+    Run one dummy forward so lazy initialization (and torch.compile capture
+    on CUDA) happens at load time instead of on the first real decision.
+    """
+    dummy = np.zeros((1, agent.input_size), dtype=np.float32)
+    agent.strategy_probs_batch(dummy)
+
+def _load_checkpoint(path, device):
+    """Load one checkpoint into a fresh agent ready for inference."""
+    agent = DeepCFRAgent(player_id=0, num_players=6, device=device)
+    agent.load_model(path)
+    # Play is inference-only; eval mode skips the training-mode
+    # bookkeeping on every forward
+    agent.advantage_net.eval()
+    agent.strategy_net.eval()
+    _warm_up(agent)
+    return agent
+
+def _load_checkpoints(paths, device, cache):
+    """
+    Load any checkpoints from paths that are missing from cache, in
+    parallel. File reads and the C++-side tensor loads release the GIL,
+    so a small thread pool overlaps disk I/O with device transfers
+    across checkpoints.
+
+    Returns a {path: exception} dict for any load that failed.
+    """
+    to_load = [path for path in dict.fromkeys(paths) if path not in cache]
+    errors = {}
+    if not to_load:
+        return errors
+
+    with ThreadPoolExecutor(max_workers=len(to_load)) as pool:
+        futures = {path: pool.submit(_load_checkpoint, path, device) for path in to_load}
+    for path, future in futures.items():
+        try:
+            cache[path] = future.result()
+        except Exception as e:
+            errors[path] = e
+    return errors
+
+def evaluate_models(models_dir, model_pattern="*.pt", num_models=6,
+                    num_games=500, batch_size=64, initial_stake=200.0,
+                    small_blind=1.0, big_blind=2.0):
+    """
+    Headless evaluation: fill all six seats with loaded models (random
+    agents for any leftover seats) and play num_games hands with no
+    human prompts.
+
+    Games run in lockstep batches like the evaluation helpers in train.py:
+    each round the batch is advanced to its decision frontier, pending
+    decisions are grouped by acting seat, and every model-backed seat
+    answers its whole group with one batched forward pass.
+
+    Returns the per-seat average profit.
+    """
+    device = 'cuda' if torch.cuda.is_available() else 'cpu'
+    print(f"Using device: {device}")
+
+    model_paths = select_random_models(models_dir, num_models, model_pattern) if models_dir else []
+
+    # One loaded agent per distinct checkpoint, shared across seats and
+    # loaded in parallel
+    loaded_agents = {}
+    load_errors = _load_checkpoints(model_paths, device, loaded_agents)
+    for path, error in load_errors.items():
+        print(f"Error loading {os.path.basename(path)}: {error}")
+
+    seat_actors = [None] * 6
+    seat_nets = [None] * 6
+    for i in range(6):
+        agent = loaded_agents.get(model_paths[i]) if i < len(model_paths) else None
+        if agent is not None:
+            seat_actors[i] = SeatView(agent, i)
+            seat_nets[i] = agent
+            print(f"Seat {i}: {os.path.basename(model_paths[i])}")
+        else:
+            seat_actors[i] = RandomAgent(i)
+            print(f"Seat {i}: random agent")
+
+    total_profits = np.zeros(6, dtype=np.float64)
+
+    for batch_start in range(0, num_games, batch_size):
+        # Create a batch of poker games with rotating buttons
+        states = [
+            pkrs.State.from_seed(
+                n_players=6,
+                button=game % 6,
+                sb=small_blind,
+                bb=big_blind,
+                stake=initial_stake,
+                seed=game
+            )
+            for game in range(batch_start, min(batch_start + batch_size, num_games))
+        ]
+
+        # Play all games in the batch to completion
+        while True:
+            # Group the decision frontier by acting seat
+            pending = [[] for _ in range(6)]
+            any_live = False
+            for i, state in enumerate(states):
+                if not state.final_state:
+                    pending[state.current_player].append(i)
+                    any_live = True
+            if not any_live:
+                break
+
+            for seat in range(6):
+                indices = pending[seat]
+                if not indices:
+                    continue
+
+                net_agent = seat_nets[seat]
+                if net_agent is not None:
+                    # One forward pass for this seat's whole group
+                    encoded = np.empty((len(indices), net_agent.input_size), dtype=np.float32)
+                    legal_masks = np.zeros((len(indices), net_agent.num_actions), dtype=np.float32)
+                    for row, i in enumerate(indices):
+                        encode_state(states[i], seat, out=encoded[row])
+                        legal_masks[row, net_agent.get_legal_action_ids(states[i])] = 1.0
+
+                    action_ids = net_agent.sample_actions_batch(encoded, legal_masks)
+                    for row, i in enumerate(indices):
+                        action = net_agent.action_id_to_pokers_action(action_ids[row], states[i])
+                        states[i] = states[i].apply_action(action)
+                else:
+                    for i in indices:
+                        action = seat_actors[seat].choose_action(states[i])
+                        states[i] = states[i].apply_action(action)
+
+        for state in states:
+            for i, p in enumerate(state.players_state):
+                total_profits[i] += p.reward
+
+    avg_profits = total_profits / num_games
+    print(f"\n--- Evaluation over {num_games} games ---")
+    for i in range(6):
+        print(f"Seat {i}: average profit {avg_profits[i]:+.2f}")
+    return avg_profits
+
+class SeatView:
+    """View of a shared agent that acts from a fixed seat."""
+    def __init__(self, agent, player_id):
+        self.agent = agent
+        self.player_id = player_id
+
+    def choose_action(self, state):
+        # Point the shared agent at this seat before acting
+        self.agent.player_id = self.player_id
+        return self.agent.choose_action(state)
+
+def _pick_raise_amount(pot, min_raise, max_raise, u=random.random):
+    """
+    Pick a pot-based raise total within [min_raise, max_raise]: half pot or
+    full pot when legal, otherwise a uniform fallback. Pure scalar branches,
+    no per-call list building; u supplies uniform draws in [0, 1).
+    """
+    half_pot = pot * 0.5
+    half_ok = min_raise <= half_pot <= max_raise
+    full_ok = min_raise <= pot <= max_raise
+    if half_ok and full_ok:
+        return half_pot if u() < 0.5 else pot
+    if half_ok:
+        return half_pot
+    if full_ok:
+        return pot
+    return min_raise + (max_raise - min_raise) * u()
 
 class RandomAgent:
     """Simple random agent for poker that ensures valid bet sizing."""
-    def __init__(self, player_id):
+    def __init__(self, player_id, seed=None):
         self.player_id = player_id
-        
+        # Per-instance uniform-draw buffer: the generator fills 4096 draws
+        # in one vectorized call and decisions pop one each, instead of a
+        # random-module call per decision. Own generator per agent means
+        # no shared RNG state across seats and seedable reproducibility.
+        self._rng = np.random.default_rng(seed)
+        self._buf = self._rng.random(4096)
+        self._idx = 0
+
+    def _u(self):
+        """Pop one uniform draw from the buffer, refilling as needed."""
+        if self._idx >= len(self._buf):
+            self._buf = self._rng.random(4096)
+            self._idx = 0
+        u = self._buf[self._idx]
+        self._idx += 1
+        return u
+
     def choose_action(self, state):
         """Choose a random legal action with proper bet sizing."""
-        if not state.legal_actions:
+        legal_actions = state.legal_actions
+        if not legal_actions:
             raise ValueError(f"No legal actions available for player {self.player_id}")
         
         # Select a random legal action
-        action_enum = random.choice(state.legal_actions)
+        action_enum = legal_actions[int(self._u() * len(legal_actions))]
         
-        # For fold, check, and call, no amount is needed
+        # For fold, check, and call, return the cached non-parametric action
         if action_enum == pkrs.ActionEnum.Fold:
-            return pkrs.Action(action_enum)
+            return _ACT_FOLD
         elif action_enum == pkrs.ActionEnum.Check:
-            return pkrs.Action(action_enum)
+            return _ACT_CHECK
         elif action_enum == pkrs.ActionEnum.Call:
-            return pkrs.Action(action_enum)
+            return _ACT_CALL
         # For raises, carefully calculate a valid amount
         elif action_enum == pkrs.ActionEnum.Raise:
             player_state = state.players_state[state.current_player]
@@ -334,33 +579,15 @@ class RandomAgent:
             # Calculate maximum raise based on player's available chips
             max_raise = player_state.stake
             
-            # If player can't even meet the minimum raise, this is an error
+            # If the player's remaining stake can't meet the minimum raise,
+            # just call (same fallback as train.py's random agent); pokers
+            # can mark Raise legal even when min_bet exceeds the stake
             if max_raise < min_raise:
-                raise ValueError(f"Raise selected as legal action but player {self.player_id} " 
-                                f"doesn't have enough chips. Min: {min_raise}, Available: {max_raise}")
-            
-            # Calculate potential raise amounts (half pot and full pot)
-            half_pot = state.pot * 0.5
-            full_pot = state.pot
+                return _ACT_CALL
             
-            # Create a list of valid raise amounts
-            valid_amounts = []
-            
-            # Add half pot if it's a valid amount
-            if min_raise <= half_pot <= max_raise:
-                valid_amounts.append(half_pot)
-                
-            # Add full pot if it's a valid amount
-            if min_raise <= full_pot <= max_raise:
-                valid_amounts.append(full_pot)
-                
-            # If we have valid pot-based raise options, choose one randomly
-            if valid_amounts:
-                raise_amount = random.choice(valid_amounts)
-            else:
-                # Otherwise use a random amount between min and max
-                raise_amount = random.uniform(min_raise, max_raise)
-                
+            # Sample a pot-based raise amount (half pot / full pot / fallback)
+            raise_amount = _pick_raise_amount(state.pot, min_raise, max_raise, self._u)
+
             # Make sure the final amount is within valid bounds
             raise_amount = max(min_raise, min(raise_amount, max_raise))
             
@@ -381,8 +608,25 @@ if __name__ == "__main__":
     parser.add_argument('--bb', type=float, default=2.0, help='Big blind amount')
     parser.add_argument('--verbose', action='store_true', help='Show detailed output')
     parser.add_argument('--no-shuffle', action='store_true', help='Do not select new random models for each game')
+    parser.add_argument('--eval-games', type=int, default=0,
+                        help='Run a headless model-vs-model evaluation over this many games instead of interactive play')
+    parser.add_argument('--eval-batch', type=int, default=64, help='Number of games per lockstep batch in headless evaluation')
     args = parser.parse_args()
     
+    if args.eval_games > 0:
+        # Headless batched evaluation, no human seat
+        evaluate_models(
+            models_dir=args.models_dir,
+            model_pattern=args.model_pattern,
+            num_models=args.num_models,
+            num_games=args.eval_games,
+            batch_size=args.eval_batch,
+            initial_stake=args.stake,
+            small_blind=args.sb,
+            big_blind=args.bb
+        )
+        sys.exit(0)
+
     # Start the game
     play_against_models(
         models_dir=args.models_dir,
@@ -7,7 +7,7 @@ import time
 import os
 import matplotlib.pyplot as plt
 import argparse
-from deep_cfr import DeepCFRAgent
+from deep_cfr import DeepCFRAgent, FOLD, CHECK, CALL, RAISE
 from model import set_verbose
 
 class RandomAgent:
@@ -24,10 +24,10 @@ class RandomAgent:
         action_enum = random.choice(state.legal_actions)
         
         # For non-raise actions, return as is.
-        if action_enum in (pkrs.ActionEnum.Fold, pkrs.ActionEnum.Check, pkrs.ActionEnum.Call):
+        if action_enum in (FOLD, CHECK, CALL):
             return pkrs.Action(action_enum)
         
-        elif action_enum == pkrs.ActionEnum.Raise:
+        elif action_enum == RAISE:
             player_state = state.players_state[state.current_player]
             current_bet = player_state.bet_chips
             
@@ -37,7 +37,7 @@ class RandomAgent:
             
             # If the player's remaining stake is less than the required min raise, just call.
             if player_state.stake < state.min_bet:
-                return pkrs.Action(pkrs.ActionEnum.Call)
+                return pkrs.Action(CALL)
             
             # Compute candidate total bets using pot-based heuristics.
             candidate_half = current_bet + state.pot * 0.5
@@ -64,36 +64,67 @@ class RandomAgent:
         
         raise ValueError(f"Unexpected action type: {action_enum}")
 
-def evaluate_against_random(agent, num_games=500, num_players=6):
-    """Evaluate the trained agent against random opponents."""
+def evaluate_against_random(agent, num_games=500, num_players=6, batch_size=64):
+    """
+    Evaluate the trained agent against random opponents.
+
+    Games are played in lockstep batches: every game in the batch is advanced
+    until it is the trained agent's turn (random opponents act immediately),
+    then all of the agent's pending decisions are answered with a single
+    strategy network forward pass instead of one batch-1 call per decision.
+    """
     random_agents = [RandomAgent(i) for i in range(num_players)]
     total_profit = 0
-    for game in range(num_games):
-        # Create a new poker game
-        state = pkrs.State.from_seed(
-            n_players=num_players,
-            button=game % num_players,  # Rotate button for fairness
-            sb=1,
-            bb=2,
-            stake=200.0,
-            seed=game
-        )
-        
-        # Play until the game is over
-        while not state.final_state:
-            current_player = state.current_player
-            
-            if current_player == agent.player_id:
-                action = agent.choose_action(state)
-            else:
-                action = random_agents[current_player].choose_action(state)
-                
-            state = state.apply_action(action)
-        
-        # Add the profit for this game
-        profit = state.players_state[agent.player_id].reward
-        total_profit += profit
-    
+
+    for batch_start in range(0, num_games, batch_size):
+        # Create a batch of poker games
+        states = [
+            pkrs.State.from_seed(
+                n_players=num_players,
+                button=game % num_players,  # Rotate button for fairness
+                sb=1,
+                bb=2,
+                stake=200.0,
+                seed=game
+            )
+            for game in range(batch_start, min(batch_start + batch_size, num_games))
+        ]
+
+        # Play all games in the batch to completion
+        while True:
+            # Advance each live game until the agent has to act (or the game ends)
+            pending = []
+            for i, state in enumerate(states):
+                while not state.final_state and state.current_player != agent.player_id:
+                    action = random_agents[state.current_player].choose_action(state)
+                    state = state.apply_action(action)
+                states[i] = state
+                if not state.final_state:
+                    pending.append(i)
+
+            if not pending:
+                break
+
+            # One forward pass for the whole decision frontier, with legal
+            # masking and sampling done on-device; states are encoded
+            # straight into rows of one preallocated matrix
+            encoded = np.empty((len(pending), agent.input_size), dtype=np.float32)
+            legal_masks = np.zeros((len(pending), agent.num_actions), dtype=np.float32)
+            for row, i in enumerate(pending):
+                encode_state(states[i], agent.player_id, out=encoded[row])
+                legal_masks[row, agent.get_legal_action_ids(states[i])] = 1.0
+
+            action_ids = agent.sample_actions_batch(encoded, legal_masks)
+
+            # Apply the sampled action to each pending game
+            for row, i in enumerate(pending):
+                action = agent.action_id_to_pokers_action(action_ids[row], states[i])
+                states[i] = states[i].apply_action(action)
+
+        # Add the profit for each game in the batch
+        for state in states:
+            total_profit += state.players_state[agent.player_id].reward
+
     return total_profit / num_games
 
 def train_deep_cfr(num_iterations=1000, traversals_per_iteration=200, 
@@ -399,13 +430,25 @@ def train_against_checkpoint(checkpoint_path, additional_iterations=1000,
     # Device configuration
     device = 'cuda' if torch.cuda.is_available() else 'cpu'
     
-    # Create opponent agents for all positions
-    opponent_agents = []
-    for pos in range(6):
-        # Create a new agent for each position
-        pos_agent = DeepCFRAgent(player_id=pos, num_players=6, device=device)
-        pos_agent.load_model(checkpoint_path)
-        opponent_agents.append(pos_agent)
+    # Load the checkpoint opponent once and share it across positions.
+    # Every seat queries the same networks, just from its own perspective,
+    # so duplicating the full agent (networks, optimizers, replay memories)
+    # per position only multiplied memory use and load time.
+    shared_opponent = DeepCFRAgent(player_id=0, num_players=6, device=device)
+    shared_opponent.load_model(checkpoint_path)
+
+    class PositionedAgent:
+        """View of a shared agent that acts from a fixed seat."""
+        def __init__(self, agent, player_id):
+            self.agent = agent
+            self.player_id = player_id
+
+        def choose_action(self, state):
+            # Point the shared agent at this seat before acting
+            self.agent.player_id = self.player_id
+            return self.agent.choose_action(state)
+
+    opponent_agents = [PositionedAgent(shared_opponent, pos) for pos in range(6)]
     
     # Initialize the new learning agent for position 0
     learning_agent = DeepCFRAgent(player_id=0, num_players=6, device=device)
@@ -466,26 +509,27 @@ def train_against_checkpoint(checkpoint_path, additional_iterations=1000,
                     print(f"WARNING: No legal actions found for player {current_player} at depth {depth}")
                 return 0
                 
-            # Encode state from this agent's perspective
-            state_tensor = torch.FloatTensor(encode_state(state, self.player_id)).to(self.device)
+            # Encode the state once from this agent's perspective and reuse it
+            # for the network input and the memory entries below
+            encoded_state = encode_state(state, self.player_id)
+            state_tensor = self._to_device(encoded_state)
             
             # Get advantages from network
-            with torch.no_grad():
-                advantages = self.advantage_net(state_tensor.unsqueeze(0))[0]
+            with torch.inference_mode():
+                advantages = self._infer(self._advantage_inference, state_tensor.unsqueeze(0))[0]
                 
-            # Use regret matching to compute strategy
+            # Use regret matching to compute strategy (vectorized over the
+            # cached legal mask; uniform fallback is cached per pattern too)
             advantages_np = advantages.cpu().numpy()
-            advantages_masked = np.zeros(self.num_actions)
-            for a in legal_action_ids:
-                advantages_masked[a] = max(advantages_np[a], 0)
-                
+            legal_mask, uniform_strategy = self._legal_mask_and_uniform(legal_action_ids)
+            advantages_masked = np.maximum(advantages_np, 0) * legal_mask
+
             # Choose an action based on the strategy
-            if sum(advantages_masked) > 0:
-                strategy = advantages_masked / sum(advantages_masked)
+            total_advantage = advantages_masked.sum()
+            if total_advantage > 0:
+                strategy = advantages_masked / total_advantage
             else:
-                strategy = np.zeros(self.num_actions)
-                for a in legal_action_ids:
-                    strategy[a] = 1.0 / len(legal_action_ids)
+                strategy = uniform_strategy
             
             # Choose actions and traverse
             action_values = np.zeros(self.num_actions)
@@ -507,38 +551,33 @@ def train_against_checkpoint(checkpoint_path, additional_iterations=1000,
                     action_values[action_id] = 0
             
             # Compute counterfactual regrets and add to memory
-            ev = sum(strategy[a] * action_values[a] for a in legal_action_ids)
+            # (strategy is zero on illegal actions, so the dot product only
+            # picks up the legal ones)
+            ev = float(np.dot(strategy, action_values))
             
             # Calculate normalization factor
-            max_abs_val = max(abs(max(action_values)), abs(min(action_values)), 1.0)
+            max_abs_val = max(np.max(np.abs(action_values)), 1.0)
+            
+            # Apply scaling
+            scale_factor = np.sqrt(iteration) if iteration > 1 else 1.0
+            
+            # Normalize, clip and scale all regrets in one vectorized pass
+            scaled_regrets = np.clip((action_values - ev) / max_abs_val, -10.0, 10.0) * scale_factor
             
             for action_id in legal_action_ids:
-                # Calculate regret
-                regret = action_values[action_id] - ev
-                
-                # Normalize and clip regret
-                normalized_regret = regret / max_abs_val
-                clipped_regret = np.clip(normalized_regret, -10.0, 10.0)
-                
-                # Apply scaling
-                scale_factor = np.sqrt(iteration) if iteration > 1 else 1.0
-                
-                self.advantage_memory.append((
-                    encode_state(state, self.player_id),  # Encode from this agent's perspective
+                self.advantage_memory.append(
+                    encoded_state,  # Encoded from this agent's perspective
                     action_id,
-                    clipped_regret * scale_factor
-                ))
-            
-            # Add to strategy memory
-            strategy_full = np.zeros(self.num_actions)
-            for a in legal_action_ids:
-                strategy_full[a] = strategy[a]
+                    scaled_regrets[action_id]
+                )
             
-            self.strategy_memory.append((
-                encode_state(state, self.player_id),  # Encode from this agent's perspective
-                strategy_full,
+            # Add to strategy memory (strategy is already zero on illegal
+            # actions, so it is stored as-is)
+            self.strategy_memory.append(
+                encoded_state,  # Encoded from this agent's perspective
+                strategy,
                 iteration
-            ))
+            )
             
             return ev
             
@@ -690,54 +729,93 @@ def train_against_checkpoint(checkpoint_path, additional_iterations=1000,
         # Restore the original cfr_traverse method to avoid side effects
         DeepCFRAgent.cfr_traverse = original_cfr_traverse
 
-def evaluate_against_checkpoint_agents(agent, opponent_agents, num_games=100):
+def evaluate_against_checkpoint_agents(agent, opponent_agents, num_games=100, batch_size=32):
     """
     Evaluate the trained agent against opponent agents.
     Each agent will receive and process observations from its own perspective.
+
+    Games run in lockstep batches like evaluate_against_random: each round
+    the batch is advanced to its decision frontier, pending decisions are
+    grouped by acting seat, and every seat backed by a DeepCFR network
+    answers its whole group with one batched forward pass. Opponents
+    without a batched path (e.g. random agents) fall back to per-state
+    choose_action.
     """
     total_profit = 0
-    
-    class AgentWrapper:
-        def __init__(self, agent):
-            self.agent = agent
-            self.player_id = agent.player_id
-            
-        def choose_action(self, state):
-            # Each agent processes the state from its own perspective
-            return self.agent.choose_action(state)
-    
-    # Wrap checkpoint agents
-    opponent_wrappers = [None] * 6
+
+    def unwrap_batched(actor):
+        # Unwrap positioned/perspective wrappers down to the concrete agent
+        while hasattr(actor, 'agent'):
+            actor = actor.agent
+        return actor if hasattr(actor, 'sample_actions_batch') else None
+
+    # Resolve each seat once: the trained agent at its own seat, opponents
+    # elsewhere, plus the underlying network agent where one exists
+    seat_actors = [None] * 6
+    seat_nets = [None] * 6
     for pos in range(6):
-        if pos != agent.player_id:
-            opponent_wrappers[pos] = AgentWrapper(opponent_agents[pos])
-    
-    for game in range(num_games):
-        # Create a new poker game with rotating button
-        state = pkrs.State.from_seed(
-            n_players=6,
-            button=game % 6,  # Rotate button for fairness
-            sb=1,
-            bb=2,
-            stake=200.0,
-            seed=game + 10000  # Using different seeds than training
-        )
-        
-        # Play until the game is over
-        while not state.final_state:
-            current_player = state.current_player
-            
-            if current_player == agent.player_id:
-                action = agent.choose_action(state)
-            else:
-                action = opponent_wrappers[current_player].choose_action(state)
-                
-            state = state.apply_action(action)
-        
-        # Add the profit for this game
-        profit = state.players_state[agent.player_id].reward
-        total_profit += profit
-    
+        if pos == agent.player_id:
+            seat_actors[pos] = agent
+            seat_nets[pos] = agent
+        else:
+            seat_actors[pos] = opponent_agents[pos]
+            seat_nets[pos] = unwrap_batched(opponent_agents[pos])
+
+    for batch_start in range(0, num_games, batch_size):
+        # Create a batch of poker games with rotating buttons
+        states = [
+            pkrs.State.from_seed(
+                n_players=6,
+                button=game % 6,  # Rotate button for fairness
+                sb=1,
+                bb=2,
+                stake=200.0,
+                seed=game + 10000  # Using different seeds than training
+            )
+            for game in range(batch_start, min(batch_start + batch_size, num_games))
+        ]
+
+        # Play all games in the batch to completion
+        while True:
+            # Group the decision frontier by acting seat
+            pending = [[] for _ in range(6)]
+            any_live = False
+            for i, state in enumerate(states):
+                if not state.final_state:
+                    pending[state.current_player].append(i)
+                    any_live = True
+            if not any_live:
+                break
+
+            for seat in range(6):
+                indices = pending[seat]
+                if not indices:
+                    continue
+
+                net_agent = seat_nets[seat]
+                if net_agent is not None:
+                    # One forward pass for this seat's whole group, encoded
+                    # from the seat's own perspective straight into rows of
+                    # one preallocated matrix
+                    encoded = np.empty((len(indices), net_agent.input_size), dtype=np.float32)
+                    legal_masks = np.zeros((len(indices), net_agent.num_actions), dtype=np.float32)
+                    for row, i in enumerate(indices):
+                        encode_state(states[i], seat, out=encoded[row])
+                        legal_masks[row, net_agent.get_legal_action_ids(states[i])] = 1.0
+
+                    action_ids = net_agent.sample_actions_batch(encoded, legal_masks)
+                    for row, i in enumerate(indices):
+                        action = net_agent.action_id_to_pokers_action(action_ids[row], states[i])
+                        states[i] = states[i].apply_action(action)
+                else:
+                    for i in indices:
+                        action = seat_actors[seat].choose_action(states[i])
+                        states[i] = states[i].apply_action(action)
+
+        # Add the profit for each game in the batch
+        for state in states:
+            total_profit += state.players_state[agent.player_id].reward
+
     return total_profit / num_games
 
 def evaluate_against_agent(agent, opponent_agent, num_games=100):
@@ -852,26 +930,27 @@ def train_with_mixed_checkpoints(checkpoint_dir, training_model_prefix="t_",
                     print(f"WARNING: No legal actions found for player {current_player} at depth {depth}")
                 return 0
                 
-            # Encode state from this agent's perspective
-            state_tensor = torch.FloatTensor(encode_state(state, self.player_id)).to(self.device)
+            # Encode the state once from this agent's perspective and reuse it
+            # for the network input and the memory entries below
+            encoded_state = encode_state(state, self.player_id)
+            state_tensor = self._to_device(encoded_state)
             
             # Get advantages from network
-            with torch.no_grad():
-                advantages = self.advantage_net(state_tensor.unsqueeze(0))[0]
+            with torch.inference_mode():
+                advantages = self._infer(self._advantage_inference, state_tensor.unsqueeze(0))[0]
                 
-            # Use regret matching to compute strategy
+            # Use regret matching to compute strategy (vectorized over the
+            # cached legal mask; uniform fallback is cached per pattern too)
             advantages_np = advantages.cpu().numpy()
-            advantages_masked = np.zeros(self.num_actions)
-            for a in legal_action_ids:
-                advantages_masked[a] = max(advantages_np[a], 0)
-                
+            legal_mask, uniform_strategy = self._legal_mask_and_uniform(legal_action_ids)
+            advantages_masked = np.maximum(advantages_np, 0) * legal_mask
+
             # Choose an action based on the strategy
-            if sum(advantages_masked) > 0:
-                strategy = advantages_masked / sum(advantages_masked)
+            total_advantage = advantages_masked.sum()
+            if total_advantage > 0:
+                strategy = advantages_masked / total_advantage
             else:
-                strategy = np.zeros(self.num_actions)
-                for a in legal_action_ids:
-                    strategy[a] = 1.0 / len(legal_action_ids)
+                strategy = uniform_strategy
             
             # Choose actions and traverse
             action_values = np.zeros(self.num_actions)
@@ -893,38 +972,33 @@ def train_with_mixed_checkpoints(checkpoint_dir, training_model_prefix="t_",
                     action_values[action_id] = 0
             
             # Compute counterfactual regrets and add to memory
-            ev = sum(strategy[a] * action_values[a] for a in legal_action_ids)
+            # (strategy is zero on illegal actions, so the dot product only
+            # picks up the legal ones)
+            ev = float(np.dot(strategy, action_values))
             
             # Calculate normalization factor
-            max_abs_val = max(abs(max(action_values)), abs(min(action_values)), 1.0)
+            max_abs_val = max(np.max(np.abs(action_values)), 1.0)
+            
+            # Apply scaling
+            scale_factor = np.sqrt(iteration) if iteration > 1 else 1.0
+            
+            # Normalize, clip and scale all regrets in one vectorized pass
+            scaled_regrets = np.clip((action_values - ev) / max_abs_val, -10.0, 10.0) * scale_factor
             
             for action_id in legal_action_ids:
-                # Calculate regret
-                regret = action_values[action_id] - ev
-                
-                # Normalize and clip regret
-                normalized_regret = regret / max_abs_val
-                clipped_regret = np.clip(normalized_regret, -10.0, 10.0)
-                
-                # Apply scaling
-                scale_factor = np.sqrt(iteration) if iteration > 1 else 1.0
-                
-                self.advantage_memory.append((
-                    encode_state(state, self.player_id),  # Encode from this agent's perspective
+                self.advantage_memory.append(
+                    encoded_state,  # Encoded from this agent's perspective
                     action_id,
-                    clipped_regret * scale_factor
-                ))
-            
-            # Add to strategy memory
-            strategy_full = np.zeros(self.num_actions)
-            for a in legal_action_ids:
-                strategy_full[a] = strategy[a]
+                    scaled_regrets[action_id]
+                )
             
-            self.strategy_memory.append((
-                encode_state(state, self.player_id),  # Encode from this agent's perspective
-                strategy_full,
+            # Add to strategy memory (strategy is already zero on illegal
+            # actions, so it is stored as-is)
+            self.strategy_memory.append(
+                encoded_state,  # Encoded from this agent's perspective
+                strategy,
                 iteration
-            ))
+            )
             
             return ev
             